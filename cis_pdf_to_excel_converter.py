@@ -22,53 +22,144 @@ Author: Security Audit Team
 Version: 1.0
 """
 
+import os
 import sys
 import re
 import json
 import argparse
 from pathlib import Path
 from datetime import datetime
-from pypdf import PdfReader
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from operator import attrgetter
+import pymupdf
+import xlsxwriter
+
+
+# Metadata and start-page detection
+_RE_TITLE = re.compile(r'CIS\s+(.+?)\s+Benchmark', re.IGNORECASE)
+_RE_VERSION = re.compile(r'v(\d+\.\d+\.\d+)')
+_RE_FIRST_REC = re.compile(r'\n1\.1(?:\.\d+)?\s+[A-Z]')
+
+# Recommendation headers
+# Matches: "1.1 Title (Automated)" or "2.3.4 Title (Manual)" or "1.1 Title (Scored)" etc.
+_RE_HEADER = re.compile(r'(?:^|\n)(\d+(?:\.\d+)+)\s+([A-Z][^\n]+?)\s*\((Automated|Manual|Scored|Not Scored)\)')
+
+# Recommendation fields
+_RE_PROFILE = re.compile(r'•?\s*(Level \d+|Profile Applicability)')
+# Every section header that can appear in a recommendation body, including
+# ones whose content is discarded, so each field stops at the next header
+_KNOWN_FIELDS = (
+    'Profile Applicability', 'Description', 'Rationale', 'Impact', 'Audit',
+    'Remediation', 'Default Value', 'References', 'CIS Controls', 'Additional Information'
+)
+# Headers are anchored at line starts without consuming the newline, and only
+# spaces/tabs after the colon are taken, so an empty field can't hide the next header
+_RE_FIELD = re.compile(r'^(%s):[^\S\n]*' % '|'.join(map(re.escape, _KNOWN_FIELDS)), re.MULTILINE)
+
+# Minimum pages per extraction worker. Starting a worker process under spawn
+# (the default on macOS/Windows) costs ~0.25 s while a dense CIS page takes
+# ~2-3 ms, so a worker needs ~200 pages before it saves more than it costs
+PARALLEL_MIN_PAGES = 200
+
+
+def _extract_page_range(pdf_path, start, stop):
+    """Extract text for pages [start, stop) (runs in a worker process)"""
+    # PyMuPDF documents cannot be shared across threads or processes,
+    # so every worker opens its own handle
+    with pymupdf.open(pdf_path) as doc:
+        return [doc.load_page(i).get_text("text") for i in range(start, stop)]
+
+
+@dataclass(slots=True)
+class Recommendation:
+    """A single CIS recommendation and its extracted fields"""
+    num: str
+    title: str
+    profile: str
+    status: str
+    description: str
+    rationale: str
+    impact: str
+    audit: str
+    remediation: str
+    default_value: str
+    references: str
+    sortkey: tuple
 
 
 class CISBenchmarkExtractor:
     """Extract recommendations from CIS Benchmark PDFs"""
     
+    # Fields kept for each recommendation and their maximum length (chars)
+    FIELD_LIMITS = {
+        'Description': 1500,
+        'Rationale': 1000,
+        'Impact': 1000,
+        'Audit': 2500,
+        'Remediation': 1500,
+        'Default Value': 500,
+        'References': 800
+    }
+    
     def __init__(self, pdf_path):
         self.pdf_path = Path(pdf_path)
-        self.reader = PdfReader(str(pdf_path))
+        # Extract every page once; all passes below read from this cache,
+        # so the document itself is not kept open
+        self._pages_text = self._extract_pages_text()
         self.recommendations = []
+        self._seen_nums = set()
         self.benchmark_title = ""
         self.benchmark_version = ""
         
+    def _extract_pages_text(self):
+        """Extract text for all pages, splitting large PDFs across processes"""
+        with pymupdf.open(str(self.pdf_path)) as doc:
+            page_count = doc.page_count
+            workers = min(os.cpu_count() or 1, page_count // PARALLEL_MIN_PAGES)
+            if workers < 2:
+                return [page.get_text("text") for page in doc]
+        
+        # One contiguous chunk per worker keeps document re-opens to a minimum
+        chunk = -(-page_count // workers)
+        bounds = [(i, min(i + chunk, page_count)) for i in range(0, page_count, chunk)]
+        with ProcessPoolExecutor(max_workers=len(bounds)) as pool:
+            futures = [pool.submit(_extract_page_range, str(self.pdf_path), lo, hi)
+                       for lo, hi in bounds]
+            return [text for future in futures for text in future.result()]
+    
     def extract_metadata(self):
         """Extract benchmark title and version from PDF"""
         # Check first 5 pages for title
-        for page_num in range(min(5, len(self.reader.pages))):
-            text = self.reader.pages[page_num].extract_text()
+        for page_num in range(min(5, len(self._pages_text))):
+            text = self._pages_text[page_num]
             
             # Look for CIS benchmark title pattern
-            title_match = re.search(r'CIS\s+(.+?)\s+Benchmark', text, re.IGNORECASE)
+            title_match = _RE_TITLE.search(text)
             if title_match:
                 self.benchmark_title = f"CIS {title_match.group(1)} Benchmark"
             
             # Look for version
-            version_match = re.search(r'v(\d+\.\d+\.\d+)', text)
+            version_match = _RE_VERSION.search(text)
             if version_match:
                 self.benchmark_version = f"v{version_match.group(1)}"
+            
+            if self.benchmark_title and self.benchmark_version:
+                break
         
         print(f"📄 Detected: {self.benchmark_title} {self.benchmark_version}")
     
     def find_recommendations_start_page(self):
         """Find where recommendations section starts"""
-        for page_num in range(min(30, len(self.reader.pages))):
-            text = self.reader.pages[page_num].extract_text()
+        for page_num in range(min(30, len(self._pages_text))):
+            text = self._pages_text[page_num]
+            
+            # Cheap substring check rules out most pages before the regex
+            if '1.1' not in text:
+                continue
             
             # Look for first recommendation pattern (1.1, 1.1.1, etc.)
-            if re.search(r'\n1\.1(?:\.\d+)?\s+[A-Z]', text):
+            if _RE_FIRST_REC.search(text):
                 print(f"📍 Recommendations start at page {page_num + 1}")
                 return page_num
         
@@ -78,37 +169,42 @@ class CISBenchmarkExtractor:
         """Extract all recommendations from PDF"""
         start_page = self.find_recommendations_start_page()
         
-        print(f"\n🔍 Extracting recommendations from {len(self.reader.pages)} pages...")
+        print(f"\n🔍 Extracting recommendations from {len(self._pages_text)} pages...")
+        
+        # Scan all pages as one text so recommendations that cross a page
+        # break are seen whole
+        text = "\n".join(self._pages_text[start_page:])
+        matches = list(_RE_HEADER.finditer(text))
         
-        for page_num in range(start_page, len(self.reader.pages)):
-            text = self.reader.pages[page_num].extract_text()
+        for i, match in enumerate(matches):
+            num = match.group(1)
+            if num in self._seen_nums:  # Already have a complete copy of this one
+                continue
+            title = match.group(2).strip()
+            status = match.group(3)
             
-            # Pattern for recommendation headers
-            # Matches: "1.1 Title (Automated)" or "2.3.4 Title (Manual)" or "1.1 Title (Scored)" etc.
-            pattern = r'(?:^|\n)(\d+(?:\.\d+)+)\s+([A-Z][^\n]+?)\s*\((Automated|Manual|Scored|Not Scored)\)'
+            # Extract content after header (next 3500 chars), stopping at
+            # the next header so fields of the following control aren't picked up
+            start_pos = match.end()
+            end_pos = start_pos + 3500
+            if i + 1 < len(matches):
+                end_pos = min(end_pos, matches[i + 1].start())
             
-            matches = re.finditer(pattern, text)
+            # Controls without audit steps are dropped anyway (e.g. table of
+            # contents entries), so skip them before slicing and parsing
+            if text.find('Audit:', start_pos, end_pos) == -1:
+                continue
+            content = text[start_pos:end_pos]
             
-            for match in matches:
-                num = match.group(1)
-                title = match.group(2).strip()
-                status = match.group(3)
-                
-                # Extract content after header (next 3000 chars)
-                start_pos = match.end()
-                content = text[start_pos:start_pos+3500]
-                
-                # Extract all components
-                rec = self._extract_recommendation_details(num, title, status, content)
-                
-                if rec and rec['audit']:  # Only add if has audit steps
-                    self.recommendations.append(rec)
-        
-        # Remove duplicates
-        self._remove_duplicates()
+            # Extract all components
+            rec = self._extract_recommendation_details(num, title, status, content)
+            
+            if rec.audit:  # Only add if has audit steps
+                self._seen_nums.add(num)
+                self.recommendations.append(rec)
         
         # Sort by number
-        self.recommendations.sort(key=lambda x: [int(p) for p in x['num'].split('.')])
+        self.recommendations.sort(key=attrgetter('sortkey'))
         
         print(f"✅ Extracted {len(self.recommendations)} complete recommendations")
     
@@ -116,60 +212,41 @@ class CISBenchmarkExtractor:
         """Extract all details for a single recommendation"""
         
         # Extract Profile/Level
-        profile_match = re.search(r'•?\s*(Level \d+|Profile Applicability)', content)
+        profile_match = _RE_PROFILE.search(content)
         profile = profile_match.group(1) if profile_match else "Level 1"
         
-        # Extract Description
-        desc_match = re.search(r'Description:\s*(.+?)(?:\nRationale:|\nImpact:|\nAudit:)', content, re.DOTALL)
-        description = desc_match.group(1).strip() if desc_match else ""
-        
-        # Extract Rationale
-        rat_match = re.search(r'Rationale:\s*(.+?)(?:\nImpact:|\nAudit:)', content, re.DOTALL)
-        rationale = rat_match.group(1).strip() if rat_match else ""
-        
-        # Extract Impact
-        impact_match = re.search(r'Impact:\s*(.+?)(?:\nAudit:|\nRemediation:)', content, re.DOTALL)
-        impact = impact_match.group(1).strip() if impact_match else ""
-        
-        # Extract Audit
-        audit_match = re.search(r'Audit:\s*(.+?)(?:\nRemediation:|\nDefault Value:)', content, re.DOTALL)
-        audit = audit_match.group(1).strip() if audit_match else ""
-        
-        # Extract Remediation
-        remed_match = re.search(r'Remediation:\s*(.+?)(?:\nDefault Value:|\nImpact:|\nReferences:)', content, re.DOTALL)
-        remediation = remed_match.group(1).strip() if remed_match else ""
-        
-        # Extract Default Value
-        default_match = re.search(r'Default Value:\s*(.+?)(?:\nReferences:|\nCIS Controls:)', content, re.DOTALL)
-        default_value = default_match.group(1).strip() if default_match else ""
-        
-        # Extract References
-        ref_match = re.search(r'References:\s*(.+?)(?:\nCIS Controls:|\nAdditional Information:)', content, re.DOTALL)
-        references = ref_match.group(1).strip() if ref_match else ""
-        
-        return {
-            'num': num,
-            'title': title,
-            'profile': profile,
-            'status': status,
-            'description': description[:1500],
-            'rationale': rationale[:1000],
-            'impact': impact[:1000],
-            'audit': audit[:2500],
-            'remediation': remediation[:1500],
-            'default_value': default_value[:500],
-            'references': references[:800]
-        }
-    
-    def _remove_duplicates(self):
-        """Remove duplicate recommendations"""
-        seen = set()
-        unique = []
-        for rec in self.recommendations:
-            if rec['num'] not in seen:
-                seen.add(rec['num'])
-                unique.append(rec)
-        self.recommendations = unique
+        # Split content into fields in one pass: each field's body runs
+        # from its header to the next header, whatever order they come in
+        spans = {}
+        matches = list(_RE_FIELD.finditer(content))
+        for i, match in enumerate(matches):
+            body_end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+            spans.setdefault(match.group(1), (match.end(), body_end))
+        
+        # Only kept fields are copied out, already cut to their length limit
+        fields = {}
+        for name, limit in self.FIELD_LIMITS.items():
+            if name in spans:
+                start, end = spans[name]
+                fields[name] = content[start:min(end, start + limit)].strip()
+            else:
+                fields[name] = ''
+        
+        return Recommendation(
+            num=num,
+            title=title,
+            # Only a handful of distinct values, so share one copy of each
+            profile=sys.intern(profile),
+            status=sys.intern(status),
+            description=fields['Description'],
+            rationale=fields['Rationale'],
+            impact=fields['Impact'],
+            audit=fields['Audit'],
+            remediation=fields['Remediation'],
+            default_value=fields['Default Value'],
+            references=fields['References'],
+            sortkey=tuple(int(p) for p in num.split('.'))
+        )
     
     def organize_by_section(self):
         """Organize recommendations by main section"""
@@ -177,7 +254,7 @@ class CISBenchmarkExtractor:
         
         for rec in self.recommendations:
             # Get main section (e.g., "1" from "1.2.3")
-            main_section = rec['num'].split('.')[0]
+            main_section = rec.num.split('.')[0]
             
             if main_section not in sections:
                 sections[main_section] = []
@@ -203,168 +280,175 @@ class ExcelWorkbookGenerator:
         '9': 'Additional Hardening'
     }
     
+    # Cell formats, registered once per workbook and shared by every sheet
+    FORMATS = {
+        'index_title': {
+            'font_size': 16, 'bold': True, 'font_color': '#FFFFFF',
+            'bg_color': '#002060', 'align': 'center', 'valign': 'vcenter'
+        },
+        'index_subtitle': {'font_size': 11, 'italic': True, 'align': 'center'},
+        'index_header': {
+            'font_size': 11, 'bold': True, 'font_color': '#FFFFFF',
+            'bg_color': '#4472C4', 'align': 'center', 'valign': 'vcenter'
+        },
+        'index_body': {'font_size': 10, 'valign': 'vcenter', 'border': 1},
+        'section_title': {
+            'font_size': 14, 'bold': True, 'font_color': '#FFFFFF',
+            'bg_color': '#00518F', 'align': 'center', 'valign': 'vcenter'
+        },
+        'section_header': {
+            'font_size': 10, 'bold': True, 'font_color': '#FFFFFF', 'bg_color': '#4472C4',
+            'align': 'center', 'valign': 'vcenter', 'text_wrap': True, 'border': 1
+        },
+        'body': {'font_size': 9, 'valign': 'top', 'text_wrap': True, 'border': 1},
+        'level1': {
+            'font_size': 9, 'bold': True, 'bg_color': '#FFC000',
+            'valign': 'top', 'text_wrap': True, 'border': 1
+        },
+        'level2': {
+            'font_size': 9, 'bold': True, 'bg_color': '#FFFF00',
+            'valign': 'top', 'text_wrap': True, 'border': 1
+        },
+    }
+    
     def __init__(self, recommendations, benchmark_title, benchmark_version):
         self.recommendations = recommendations
         self.benchmark_title = benchmark_title
         self.benchmark_version = benchmark_version
-        self.wb = Workbook()
-        self.wb.remove(self.wb.active)  # Remove default sheet
+        self.wb = None  # Created in generate() (xlsxwriter needs the output path up front)
+        self.formats = {}
     
     def create_index_sheet(self, sections):
         """Create index/overview sheet"""
-        ws = self.wb.create_sheet('📑 INDEX')
+        ws = self.wb.add_worksheet('📑 INDEX')
+        
+        ws.set_column(0, 0, 10)
+        ws.set_column(1, 1, 32)
+        ws.set_column(2, 2, 10)
+        ws.set_column(3, 3, 32)
+        ws.set_column(4, 4, 50)
         
         # Title
-        ws.merge_cells('A1:E1')
-        title = ws.cell(1, 1, f'{self.benchmark_title} {self.benchmark_version}')
-        title.font = Font(size=16, bold=True, color='FFFFFF')
-        title.fill = PatternFill(start_color='002060', end_color='002060', fill_type='solid')
-        title.alignment = Alignment(horizontal='center', vertical='center')
-        ws.row_dimensions[1].height = 40
+        ws.set_row(0, 40)
+        ws.merge_range('A1:E1', f'{self.benchmark_title} {self.benchmark_version}',
+                       self.formats['index_title'])
         
         # Subtitle
-        ws.merge_cells('A2:E2')
-        subtitle = ws.cell(2, 1, f'Audit Checklist - Generated on {datetime.now().strftime("%Y-%m-%d")}')
-        subtitle.font = Font(size=11, italic=True)
-        subtitle.alignment = Alignment(horizontal='center')
-        ws.row_dimensions[2].height = 25
-        
-        ws.append([])
+        ws.set_row(1, 25)
+        ws.merge_range('A2:E2', f'Audit Checklist - Generated on {datetime.now().strftime("%Y-%m-%d")}',
+                       self.formats['index_subtitle'])
         
         # Headers
         headers = ['Section', 'Section Name', 'Controls', 'Tab Name', 'Description']
-        ws.append(headers)
-        for col in range(1, 6):
-            cell = ws.cell(4, col)
-            cell.font = Font(size=11, bold=True, color='FFFFFF')
-            cell.fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-        
-        ws.column_dimensions['A'].width = 10
-        ws.column_dimensions['B'].width = 32
-        ws.column_dimensions['C'].width = 10
-        ws.column_dimensions['D'].width = 32
-        ws.column_dimensions['E'].width = 50
+        ws.write_row(3, 0, headers, self.formats['index_header'])
         
         # Add section rows
-        row = 5
+        row = 4
         for sec_num in sorted(sections.keys(), key=int):
             sec_name = self.SECTION_NAMES.get(sec_num, f'Section {sec_num}')
             sec_recs = sections[sec_num]
             sheet_name = f"{sec_num}. {sec_name}"[:31]
             
-            ws.append([sec_num, sec_name, len(sec_recs), sheet_name, ''])
-            
-            for col in range(1, 6):
-                cell = ws.cell(row, col)
-                cell.font = Font(size=10)
-                cell.alignment = Alignment(vertical='center')
-                cell.border = Border(
-                    left=Side(style='thin'), right=Side(style='thin'),
-                    top=Side(style='thin'), bottom=Side(style='thin')
-                )
-            ws.row_dimensions[row].height = 30
+            ws.set_row(row, 30)
+            ws.write_row(row, 0, [sec_num, sec_name, len(sec_recs), sheet_name, ''],
+                         self.formats['index_body'])
             row += 1
     
     def create_section_sheet(self, section_num, section_name, recommendations):
         """Create sheet for a section"""
         sheet_name = f"{section_num}. {section_name}"[:31]
-        ws = self.wb.create_sheet(sheet_name)
+        ws = self.wb.add_worksheet(sheet_name)
+        
+        # Column widths
+        ws.set_column(0, 0, 8)
+        ws.set_column(1, 1, 42)
+        ws.set_column(2, 2, 10)
+        ws.set_column(3, 3, 55)
+        ws.set_column(4, 4, 60)
+        ws.set_column(5, 5, 55)
+        ws.set_column(6, 6, 35)
+        ws.set_column(7, 7, 40)
         
         # Title
-        ws.merge_cells('A1:H1')
+        ws.set_row(0, 35)
         title = f'{self.benchmark_title} - Section {section_num}: {section_name}'
-        cell = ws.cell(1, 1, title)
-        cell.font = Font(size=14, bold=True, color='FFFFFF')
-        cell.fill = PatternFill(start_color='00518F', end_color='00518F', fill_type='solid')
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        ws.row_dimensions[1].height = 35
+        ws.merge_range('A1:H1', title, self.formats['section_title'])
         
         # Headers
         headers = ['#', 'Control Title', 'Level', 'Description & Impact', 
                   'Audit Steps (CLI & GUI)', 'Remediation', 'Default Value', 'References/Status']
-        ws.append(headers)
-        
-        for col in range(1, 9):
-            cell = ws.cell(2, col)
-            cell.font = Font(size=10, bold=True, color='FFFFFF')
-            cell.fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-            cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-            cell.border = Border(
-                left=Side(style='thin'), right=Side(style='thin'),
-                top=Side(style='thin'), bottom=Side(style='thin')
-            )
-        ws.row_dimensions[2].height = 40
-        
-        # Column widths
-        ws.column_dimensions['A'].width = 8
-        ws.column_dimensions['B'].width = 42
-        ws.column_dimensions['C'].width = 10
-        ws.column_dimensions['D'].width = 55
-        ws.column_dimensions['E'].width = 60
-        ws.column_dimensions['F'].width = 55
-        ws.column_dimensions['G'].width = 35
-        ws.column_dimensions['H'].width = 40
+        ws.set_row(1, 40)
+        ws.write_row(1, 0, headers, self.formats['section_header'])
         
         # Add recommendations
-        row = 3
+        row = 2
         for rec in recommendations:
             self._add_recommendation_row(ws, row, rec)
             row += 1
     
-    def _add_recommendation_row(self, ws, row, rec):
-        """Add a recommendation row"""
+    @staticmethod
+    def _build_recommendation_row(rec):
+        """Prepare a recommendation row: (height, level format name, head cells, tail cells)"""
         # Combine description, rationale, impact
-        desc_full = rec['description']
-        if rec['rationale']:
-            desc_full += f"\n\nRATIONALE:\n{rec['rationale']}"
-        if rec['impact']:
-            desc_full += f"\n\nIMPACT:\n{rec['impact']}"
-        
-        data = [
-            rec['num'],
-            rec['title'],
-            rec['profile'],
-            desc_full,
-            rec['audit'],
-            rec['remediation'],
-            rec['default_value'],
-            rec['references']
-        ]
-        
-        ws.append(data)
-        
-        # Style cells
-        for col in range(1, 9):
-            cell = ws.cell(row, col)
-            cell.font = Font(size=9)
-            cell.alignment = Alignment(vertical='top', wrap_text=True)
-            cell.border = Border(
-                left=Side(style='thin'), right=Side(style='thin'),
-                top=Side(style='thin'), bottom=Side(style='thin')
-            )
-            
-            # Color code Level column
-            if col == 3:
-                if 'Level 1' in rec['profile']:
-                    cell.fill = PatternFill(start_color='FFC000', end_color='FFC000', fill_type='solid')
-                    cell.font = Font(size=9, bold=True)
-                elif 'Level 2' in rec['profile']:
-                    cell.fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
-                    cell.font = Font(size=9, bold=True)
+        parts = [rec.description]
+        if rec.rationale:
+            parts.append(f"\n\nRATIONALE:\n{rec.rationale}")
+        if rec.impact:
+            parts.append(f"\n\nIMPACT:\n{rec.impact}")
+        desc_full = "".join(parts)
         
         # Dynamic row height
-        max_lines = max(
-            len(desc_full.split('\n')),
-            len(rec['audit'].split('\n')),
-            len(rec['remediation'].split('\n'))
+        max_lines = 1 + max(
+            desc_full.count('\n'),
+            rec.audit.count('\n'),
+            rec.remediation.count('\n')
         )
-        ws.row_dimensions[row].height = min(max(max_lines * 14, 80), 350)
+        height = min(max(max_lines * 14, 80), 350)
+        
+        # Color code Level column
+        level_fmt = 'body'
+        if 'Level 1' in rec.profile:
+            level_fmt = 'level1'
+        elif 'Level 2' in rec.profile:
+            level_fmt = 'level2'
+        
+        # Cells either side of the Level column, which has its own format
+        head = [rec.num, rec.title]
+        tail = [
+            desc_full,
+            rec.audit,
+            rec.remediation,
+            rec.default_value,
+            rec.references
+        ]
+        return height, level_fmt, head, tail
+    
+    def _add_recommendation_row(self, ws, row, rec):
+        """Add a recommendation row (row is zero-based)"""
+        height, level_fmt, head, tail = self._build_recommendation_row(rec)
+        ws.set_row(row, height)
+        
+        # PDF text always goes through write_string: write_row's type guessing
+        # would turn values such as '{=...}' into formulas
+        for col, value in enumerate(head):
+            ws.write_string(row, col, value, self.formats['body'])
+        ws.write_string(row, 2, rec.profile, self.formats[level_fmt])
+        for col, value in enumerate(tail, 3):
+            ws.write_string(row, col, value, self.formats['body'])
     
     def generate(self, sections, output_path):
         """Generate complete workbook"""
         print(f"\n📊 Generating Excel workbook...")
         
+        # constant_memory flushes each row to disk once the next one is started;
+        # every sheet below is written strictly top to bottom
+        self.wb = xlsxwriter.Workbook(str(output_path), {
+            'constant_memory': True,
+            'strings_to_urls': False,
+            'strings_to_formulas': False
+        })
+        self.formats = {name: self.wb.add_format(props) for name, props in self.FORMATS.items()}
+        
         # Create index
         self.create_index_sheet(sections)
         print(f"   ✓ Created index sheet")
@@ -378,7 +462,7 @@ class ExcelWorkbookGenerator:
             print(f"   ✓ Created: Section {sec_num} - {sec_name} ({len(sec_recs)} controls)")
         
         # Save
-        self.wb.save(output_path)
+        self.wb.close()
         print(f"\n✅ Excel workbook saved: {output_path}")
         print(f"   Total Sheets: {len(sections) + 1} (1 Index + {len(sections)} Sections)")
         print(f"   Total Controls: {len(self.recommendations)}")
@@ -456,7 +540,7 @@ The script will:
         print(f"   • Professional formatting with color coding")
         print(f"   • Ready for audit use!")
         
-    except FileNotFoundError:
+    except (FileNotFoundError, pymupdf.FileNotFoundError):
         print(f"❌ ERROR: File not found: {args.input_pdf}")
         sys.exit(1)
     except Exception as e:
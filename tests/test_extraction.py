@@ -0,0 +1,49 @@
+"""Tests for CISBenchmarkExtractor field parsing"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cis_pdf_to_excel_converter import CISBenchmarkExtractor
+
+
+def extract(content):
+    """Parse recommendation content without opening a PDF"""
+    extractor = CISBenchmarkExtractor.__new__(CISBenchmarkExtractor)
+    return extractor._extract_recommendation_details('1.1', 'Ensure thing', 'Automated', content)
+
+
+class FieldParsingTests(unittest.TestCase):
+    
+    def test_fields_split_at_next_header(self):
+        rec = extract('\nDescription:\nSome text.\nAudit:\nrun cmd\nRemediation:\nfix it\n')
+        self.assertEqual(rec.description, 'Some text.')
+        self.assertEqual(rec.audit, 'run cmd')
+        self.assertEqual(rec.remediation, 'fix it')
+    
+    def test_empty_field_before_audit(self):
+        rec = extract('\nImpact:\n\nAudit:\nrun cmd\nRemediation:\nfix it\n')
+        self.assertEqual(rec.impact, '')
+        self.assertEqual(rec.audit, 'run cmd')
+        self.assertEqual(rec.remediation, 'fix it')
+    
+    def test_empty_profile_applicability_before_description(self):
+        rec = extract('\nProfile Applicability:\nDescription:\nSome text.\nAudit:\nrun cmd\n')
+        self.assertEqual(rec.description, 'Some text.')
+        self.assertEqual(rec.audit, 'run cmd')
+    
+    def test_profile_block_not_part_of_previous_field(self):
+        rec = extract('\nImpact:\nNone.\nProfile Applicability:\n• Level 2\nAudit:\nrun cmd\n')
+        self.assertEqual(rec.impact, 'None.')
+        self.assertEqual(rec.audit, 'run cmd')
+    
+    def test_body_on_header_line(self):
+        rec = extract('\nAudit: run cmd\nRemediation: fix it\n')
+        self.assertEqual(rec.audit, 'run cmd')
+        self.assertEqual(rec.remediation, 'fix it')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+"""Tests for ExcelWorkbookGenerator output"""
+
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cis_pdf_to_excel_converter import ExcelWorkbookGenerator, Recommendation
+
+
+class WorkbookTests(unittest.TestCase):
+    
+    def test_pdf_text_written_as_plain_strings(self):
+        rec = Recommendation(
+            num='1.1', title='=HYPERLINK("x")', profile='Level 1', status='Automated',
+            description='', rationale='', impact='', audit='{=SUM(1,2)}',
+            remediation='=1+1', default_value='', references='', sortkey=(1, 1)
+        )
+        generator = ExcelWorkbookGenerator([rec], 'CIS Test Benchmark', 'v1.0.0')
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / 'out.xlsx'
+            generator.generate({'1': [rec]}, out)
+            with zipfile.ZipFile(out) as xlsx:
+                sheet = xlsx.read('xl/worksheets/sheet2.xml').decode()
+        self.assertNotIn('<f', sheet)
+
+
+if __name__ == '__main__':
+    unittest.main()